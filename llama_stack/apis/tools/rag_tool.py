@@ -8,7 +8,6 @@ from enum import Enum, StrEnum
 from typing import Annotated, Any, Literal, Protocol
 
 from pydantic import BaseModel, Field, field_validator
-from typing_extensions import runtime_checkable
 
 from llama_stack.apis.common.content_types import URL, InterleavedContent
 from llama_stack.providers.utils.telemetry.trace_protocol import trace_protocol
@@ -182,8 +181,11 @@ class RAGQueryConfig(BaseModel):
         return v
 
 
-@runtime_checkable
-@trace_protocol
+# Not @runtime_checkable: isinstance() against a runtime-checkable protocol walks
+# the whole method table on every call, and nothing needs a structural check here.
+# Protocol compliance is verified by attribute probes in the resolver instead.
+# insert/query are hot at high QPS, so only a sample of calls is traced.
+@trace_protocol(sample_rate=0.01)
 class RAGToolRuntime(Protocol):
     @webmethod(route="/tool-runtime/rag-tool/insert", method="POST")
     async def insert(
@@ -6,10 +6,26 @@
 
 from typing import Any
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class RagToolRuntimeConfig(BaseModel):
+    query_cache_size: int = Field(
+        default=0,
+        ge=0,
+        description="Number of recent query results to cache. 0 disables query caching.",
+    )
+    query_cache_semantic_threshold: float = Field(
+        default=0.95,
+        gt=0.0,
+        le=1.0,
+        description="Minimum cosine similarity for a cached query result to be reused for a near-duplicate query.",
+    )
+    query_cache_embedding_model: str | None = Field(
+        default=None,
+        description="Embedding model used for semantic query-cache matching. None disables the semantic layer.",
+    )
+
     @classmethod
     def sample_run_config(cls, __distro_dir__: str, **kwargs: Any) -> dict[str, Any]:
         return {}
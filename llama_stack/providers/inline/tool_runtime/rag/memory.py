@@ -5,6 +5,7 @@
 # the root directory of this source tree.
 
 import asyncio
+import heapq
 import logging
 import secrets
 import string
@@ -41,9 +42,14 @@ from llama_stack.providers.utils.memory.vector_store import (
 
 from .config import RagToolRuntimeConfig
 from .context_retriever import generate_rag_query
+from .query_cache import QueryCache
 
 log = logging.getLogger(__name__)
 
+# built once; constructing a TypeAdapter compiles a validator core, which is
+# too expensive to repeat on every tool invocation
+RAG_QUERY_CONFIG_ADAPTER = TypeAdapter(RAGQueryConfig)
+
 
 def make_random_string(length: int = 8):
     return "".join(secrets.choice(string.ascii_letters + string.digits) for _ in range(length))
@@ -59,6 +65,20 @@ class MemoryToolRuntimeImpl(ToolGroupsProtocolPrivate, ToolRuntime, RAGToolRunti
         self.config = config
         self.vector_io_api = vector_io_api
         self.inference_api = inference_api
+        self.query_cache: QueryCache | None = None
+        if config.query_cache_size > 0:
+            self.query_cache = QueryCache(
+                max_size=config.query_cache_size,
+                semantic_threshold=config.query_cache_semantic_threshold,
+                embed_fn=self._embed_query if config.query_cache_embedding_model else None,
+            )
+
+    async def _embed_query(self, query_text: str) -> list[float] | None:
+        model_id = self.config.query_cache_embedding_model
+        if model_id is None:  # only wired into the cache when a model is configured
+            return None
+        response = await self.inference_api.embeddings(model_id, [query_text])
+        return response.embeddings[0] if response.embeddings else None
 
     async def initialize(self):
         pass
@@ -100,6 +120,9 @@ class MemoryToolRuntimeImpl(ToolGroupsProtocolPrivate, ToolRuntime, RAGToolRunti
             vector_db_id=vector_db_id,
         )
 
+        if self.query_cache:
+            self.query_cache.invalidate(vector_db_id)
+
     async def query(
         self,
         content: InterleavedContent,
@@ -112,34 +135,59 @@ class MemoryToolRuntimeImpl(ToolGroupsProtocolPrivate, ToolRuntime, RAGToolRunti
             )
 
         query_config = query_config or RAGQueryConfig()
+        if self.query_cache is None:
+            return await self._execute_query(content, vector_db_ids, query_config)
+
+        return await self.query_cache.fetch(
+            query_text=interleaved_content_as_str(content),
+            vector_db_ids=vector_db_ids,
+            query_config=query_config,
+            compute=lambda: self._execute_query(content, vector_db_ids, query_config),
+        )
+
+    async def _execute_query(
+        self,
+        content: InterleavedContent,
+        vector_db_ids: list[str],
+        query_config: RAGQueryConfig,
+    ) -> RAGQueryResult:
         query = await generate_rag_query(
             query_config.query_generator_config,
             content,
             inference_api=self.inference_api,
         )
-        tasks = [
-            self.vector_io_api.query_chunks(
-                vector_db_id=vector_db_id,
-                query=query,
-                params={
-                    "mode": query_config.mode,
-                    "max_chunks": query_config.max_chunks,
-                    "score_threshold": 0.0,
-                    "ranker": query_config.ranker,
-                },
-            )
-            for vector_db_id in vector_db_ids
-        ]
-        results: list[QueryChunksResponse] = await asyncio.gather(*tasks)
-        chunks = [c for r in results for c in r.chunks]
-        scores = [s for r in results for s in r.scores]
+        # fan out per-DB lookups concurrently, bounded so a single backing store
+        # isn't overloaded when many vector DBs are queried at once
+        semaphore = asyncio.Semaphore(min(len(vector_db_ids), 8))
 
-        if not chunks:
+        async def _query_single(vector_db_id: str) -> QueryChunksResponse:
+            async with semaphore:
+                return await self.vector_io_api.query_chunks(
+                    vector_db_id=vector_db_id,
+                    query=query,
+                    params={
+                        "mode": query_config.mode,
+                        "max_chunks": query_config.max_chunks,
+                        "score_threshold": 0.0,
+                        "ranker": query_config.ranker,
+                    },
+                )
+
+        results: list[QueryChunksResponse] = await asyncio.gather(
+            *(_query_single(vector_db_id) for vector_db_id in vector_db_ids)
+        )
+
+        if not any(r.chunks for r in results):
             return RAGQueryResult(content=None)
 
-        # sort by score
-        chunks, scores = zip(*sorted(zip(chunks, scores, strict=False), key=lambda x: x[1], reverse=True), strict=False)  # type: ignore
-        chunks = chunks[: query_config.max_chunks]
+        # heap-based top-k over the union of per-DB results; cheaper than a
+        # full sort when each DB already returns at most max_chunks entries
+        top = heapq.nlargest(
+            query_config.max_chunks,
+            ((c, s) for r in results for c, s in zip(r.chunks, r.scores, strict=False)),
+            key=lambda pair: pair[1],
+        )
+        chunks, scores = zip(*top, strict=False)  # type: ignore
 
         tokens = 0
         picked: list[InterleavedContentItem] = [
@@ -224,7 +272,7 @@ class MemoryToolRuntimeImpl(ToolGroupsProtocolPrivate, ToolRuntime, RAGToolRunti
         vector_db_ids = kwargs.get("vector_db_ids", [])
         query_config = kwargs.get("query_config")
         if query_config:
-            query_config = TypeAdapter(RAGQueryConfig).validate_python(query_config)
+            query_config = RAG_QUERY_CONFIG_ADAPTER.validate_python(query_config)
         else:
             # handle someone passing an empty dict
             query_config = RAGQueryConfig()
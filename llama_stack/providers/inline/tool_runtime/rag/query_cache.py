@@ -0,0 +1,288 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the terms described in the LICENSE file in
+# the root directory of this source tree.
+
+import asyncio
+import hashlib
+import logging
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+import numpy as np
+
+from llama_stack.apis.tools import RAGQueryConfig, RAGQueryResult
+
+log = logging.getLogger(__name__)
+
+
+def _normalize_text(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+def _digest(text: str) -> bytes:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+
+def quantize_int8(vec: np.ndarray) -> tuple[np.ndarray, np.float32]:
+    """Quantize a float32 vector to int8 with a per-vector max-abs scale.
+
+    The dot product of two quantized vectors times the product of their scales
+    approximates the original dot product to within ~1% for embedding-sized
+    vectors, at a quarter of the memory traffic.
+    """
+    scale = np.float32(np.max(np.abs(vec)) / 127.0)
+    if scale == 0:
+        scale = np.float32(1.0)
+    return np.round(vec / scale).astype(np.int8), scale
+
+
+class _CacheEntry:
+    __slots__ = ("result", "vector_db_ids")
+
+    def __init__(self, result: RAGQueryResult, vector_db_ids: tuple[str, ...]):
+        self.result = result
+        self.vector_db_ids = vector_db_ids
+
+
+class _NumpySemanticIndex:
+    """Exact cosine scan over the cached query embeddings.
+
+    O(N*d) per lookup, which is fine while the cache stays small; larger
+    caches use the HNSW-backed index below when hnswlib is installed. Rows
+    are stored int8-quantized (with per-vector scales) so the scan moves a
+    quarter of the bytes that float32 storage would.
+    """
+
+    def __init__(self):
+        self._quantized: np.ndarray | None = None  # (N, d) int8
+        self._scales = np.empty((0,), dtype=np.float32)
+        self._keys: list[bytes] = []
+        self._namespaces = np.empty((0,), dtype="S16")
+
+    def add(self, key: bytes, namespace: bytes, embedding: np.ndarray) -> None:
+        quantized, scale = quantize_int8(embedding)
+        row = quantized.reshape(1, -1)
+        self._quantized = row if self._quantized is None else np.vstack([self._quantized, row])
+        self._scales = np.append(self._scales, scale)
+        self._keys.append(key)
+        self._namespaces = np.append(self._namespaces, np.bytes_(namespace))
+
+    def search(self, embedding: np.ndarray, namespace: bytes, threshold: float) -> bytes | None:
+        if self._quantized is None or len(self._keys) == 0:
+            return None
+        # rows are L2-normalized before quantization, so the scaled integer
+        # dot product approximates cosine similarity; the namespace and
+        # threshold filters stay in numpy as well
+        query_quantized, query_scale = quantize_int8(embedding)
+        scores = (self._quantized.astype(np.int32) @ query_quantized.astype(np.int32)) * (self._scales * query_scale)
+        mask = (scores >= threshold) & (self._namespaces == namespace)
+        if not mask.any():
+            return None
+        best = int(np.argmax(np.where(mask, scores, -np.inf)))
+        return self._keys[best]
+
+    def remove(self, keys: set[bytes]) -> None:
+        if self._quantized is None:
+            return
+        keep = [i for i, key in enumerate(self._keys) if key not in keys]
+        if len(keep) == len(self._keys):
+            return
+        self._keys = [self._keys[i] for i in keep]
+        self._namespaces = self._namespaces[keep]
+        self._scales = self._scales[keep]
+        self._quantized = self._quantized[keep] if keep else None
+
+
+class _HnswSemanticIndex:
+    """Approximate nearest-neighbor index over cached query embeddings.
+
+    Backed by hnswlib so lookup cost stays roughly logarithmic as the cache
+    grows, instead of the O(N*d) scan of the numpy fallback. All operations
+    run synchronously on the event-loop thread, so add/search never execute
+    concurrently and no extra locking is needed.
+    """
+
+    M = 32
+    EF_CONSTRUCTION = 200
+    EF_SEARCH = 64
+
+    def __init__(self, max_elements: int):
+        self._max_elements = max(max_elements, 16)
+        self._index: Any = None  # hnswlib.Index, created lazily once the embedding dim is known
+        self._meta: dict[int, tuple[bytes, bytes]] = {}  # label -> (key, namespace)
+        self._label_by_key: dict[bytes, int] = {}
+        self._next_label = 0
+        self._deleted_count = 0
+
+    def add(self, key: bytes, namespace: bytes, embedding: np.ndarray) -> None:
+        import hnswlib
+
+        if self._index is None:
+            self._index = hnswlib.Index(space="cosine", dim=embedding.shape[0])
+            self._index.init_index(
+                max_elements=self._max_elements,
+                M=self.M,
+                ef_construction=self.EF_CONSTRUCTION,
+                allow_replace_deleted=True,
+            )
+            self._index.set_ef(self.EF_SEARCH)
+        if self._deleted_count == 0 and self._index.get_current_count() >= self._max_elements:
+            # no deleted slot to reuse and the index is full, so grow it
+            self._max_elements *= 2
+            self._index.resize_index(self._max_elements)
+
+        label = self._next_label
+        self._next_label += 1
+        # reusing deleted slots keeps memory proportional to live entries
+        # rather than to total insertions
+        self._index.add_items(embedding.reshape(1, -1), [label], replace_deleted=True)
+        if self._deleted_count > 0:
+            self._deleted_count -= 1
+        self._meta[label] = (key, namespace)
+        self._label_by_key[key] = label
+
+    def search(self, embedding: np.ndarray, namespace: bytes, threshold: float) -> bytes | None:
+        if not self._meta:
+            return None
+        k = min(8, len(self._meta))
+        labels, distances = self._index.knn_query(embedding.reshape(1, -1), k=k)
+        for label, distance in zip(labels[0], distances[0], strict=False):
+            # hnswlib cosine distance is 1 - similarity, and results are sorted
+            # ascending, so everything past the first miss is below threshold too
+            if 1.0 - distance < threshold:
+                break
+            meta = self._meta.get(int(label))
+            if meta is not None and meta[1] == namespace:
+                return meta[0]
+        return None
+
+    def remove(self, keys: set[bytes]) -> None:
+        for key in keys:
+            label = self._label_by_key.pop(key, None)
+            if label is not None:
+                self._index.mark_deleted(label)
+                self._deleted_count += 1
+                del self._meta[label]
+
+
+def _create_semantic_index(max_elements: int) -> _HnswSemanticIndex | _NumpySemanticIndex:
+    try:
+        import hnswlib  # noqa: F401
+
+        return _HnswSemanticIndex(max_elements)
+    except ImportError:
+        return _NumpySemanticIndex()
+
+
+class QueryCache:
+    """Two-level cache for RAG query results.
+
+    Level 1 is an exact-match LRU keyed by the normalized query text plus the
+    vector DB ids and query config it was issued against. Level 2 is an
+    optional semantic layer: when an ``embed_fn`` is provided, query embeddings
+    of recent entries are kept and a new query whose cosine similarity to a
+    cached query meets ``semantic_threshold`` reuses that entry's result.
+    Concurrent misses on the same key are collapsed so the underlying
+    retrieval runs once.
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        semantic_threshold: float = 0.95,
+        embed_fn: Callable[[str], Awaitable[list[float] | None]] | None = None,
+    ):
+        self.max_size = max_size
+        self.semantic_threshold = semantic_threshold
+        self.embed_fn = embed_fn
+
+        self._entries: OrderedDict[bytes, _CacheEntry] = OrderedDict()
+        self._locks: dict[bytes, asyncio.Lock] = {}
+        self._semantic = _create_semantic_index(max_size)
+
+    async def fetch(
+        self,
+        query_text: str,
+        vector_db_ids: list[str],
+        query_config: RAGQueryConfig,
+        compute: Callable[[], Awaitable[RAGQueryResult]],
+    ) -> RAGQueryResult:
+        """Return a cached result for this query if available, else run `compute` and cache it."""
+        namespace = _digest(f"{','.join(sorted(vector_db_ids))}|{query_config.model_dump_json()}")
+        key = _digest(f"{_normalize_text(query_text)}|") + namespace
+
+        entry = self._get(key)
+        if entry is not None:
+            return entry.result
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        try:
+            async with lock:
+                # another task may have populated the entry while we waited
+                entry = self._get(key)
+                if entry is not None:
+                    return entry.result
+
+                embedding = await self._embed(query_text)
+                if embedding is not None:
+                    semantic_key = self._semantic.search(embedding, namespace, self.semantic_threshold)
+                    if semantic_key is not None:
+                        entry = self._get(semantic_key)
+                        if entry is not None:
+                            # store under the exact key too, so an identical
+                            # repeat hits level 1 instead of re-embedding
+                            self._put(key, entry, namespace, embedding)
+                            return entry.result
+
+                result = await compute()
+                self._put(key, _CacheEntry(result, tuple(vector_db_ids)), namespace, embedding)
+                return result
+        finally:
+            # drop the lock on every exit path (semantic hits and compute
+            # failures included) so the dict doesn't grow with query diversity
+            self._locks.pop(key, None)
+
+    def invalidate(self, vector_db_id: str) -> None:
+        """Drop all cached results that were retrieved from the given vector DB."""
+        stale = [key for key, entry in self._entries.items() if vector_db_id in entry.vector_db_ids]
+        for key in stale:
+            del self._entries[key]
+        if stale:
+            self._semantic.remove(set(stale))
+
+    async def _embed(self, query_text: str) -> np.ndarray | None:
+        if self.embed_fn is None:
+            return None
+        try:
+            embedding = await self.embed_fn(query_text)
+        except Exception as e:
+            log.debug(f"Query cache embedding failed; falling back to exact matching only: {e}")
+            return None
+        if embedding is None:
+            return None
+        vec = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vec)
+        if norm == 0:
+            return None
+        return vec / norm
+
+    def _get(self, key: bytes) -> _CacheEntry | None:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def _put(self, key: bytes, entry: _CacheEntry, namespace: bytes, embedding: np.ndarray | None) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        if embedding is not None:
+            self._semantic.add(key, namespace, embedding)
+        evicted = set()
+        while len(self._entries) > self.max_size:
+            old_key, _ = self._entries.popitem(last=False)
+            evicted.add(old_key)
+        if evicted:
+            self._semantic.remove(evicted)
@@ -39,6 +39,7 @@ class GroqInferenceAdapter(LiteLLMOpenAIMixin):
             provider_data_api_key_field="groq_api_key",
         )
         self.config = config
+        self._openai_clients: dict[str, AsyncOpenAI] = {}
 
     async def initialize(self):
         await super().initialize()
@@ -47,10 +48,17 @@ class GroqInferenceAdapter(LiteLLMOpenAIMixin):
         await super().shutdown()
 
     def _get_openai_client(self) -> AsyncOpenAI:
-        return AsyncOpenAI(
-            base_url=f"{self.config.url}/openai/v1",
-            api_key=self.get_api_key(),
-        )
+        # Clients are cached per api-key so repeated calls reuse the same pooled
+        # httpx transport instead of paying connection/TLS setup on every request.
+        api_key = self.get_api_key()
+        client = self._openai_clients.get(api_key)
+        if client is None:
+            client = AsyncOpenAI(
+                base_url=f"{self.config.url}/openai/v1",
+                api_key=api_key,
+            )
+            self._openai_clients[api_key] = client
+        return client
 
     async def openai_chat_completion(
         self,
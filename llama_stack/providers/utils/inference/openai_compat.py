@@ -1260,21 +1260,18 @@ async def convert_openai_chat_completion_stream(
 
 
 async def prepare_openai_completion_params(**params):
-    async def _prepare_value(value: Any) -> Any:
-        new_value = value
+    # purely synchronous conversion; recursing without awaits avoids allocating
+    # a coroutine per value on a path that runs for every completion request
+    def _prepare_value(value: Any) -> Any:
         if isinstance(value, list):
-            new_value = [await _prepare_value(v) for v in value]
+            return [_prepare_value(v) for v in value]
         elif isinstance(value, dict):
-            new_value = {k: await _prepare_value(v) for k, v in value.items()}
+            return {k: _prepare_value(v) for k, v in value.items()}
         elif isinstance(value, BaseModel):
-            new_value = value.model_dump(exclude_none=True)
-        return new_value
-
-    completion_params = {}
-    for k, v in params.items():
-        if v is not None:
-            completion_params[k] = await _prepare_value(v)
-    return completion_params
+            return value.model_dump(exclude_none=True)
+        return value
+
+    return {k: _prepare_value(v) for k, v in params.items() if v is not None}
 
 
 class OpenAICompletionToLlamaStackMixin:
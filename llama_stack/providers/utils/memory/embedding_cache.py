@@ -0,0 +1,115 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the terms described in the LICENSE file in
+# the root directory of this source tree.
+
+import hashlib
+import os
+from collections import OrderedDict
+
+import aiosqlite
+import numpy as np
+
+# Directory for the on-disk cache database; embedding caching is disabled
+# unless this environment variable is set.
+EMBEDDING_CACHE_DIR_ENV = "LLAMA_STACK_EMBEDDING_CACHE_DIR"
+
+# Keys per SELECT; stays well under SQLite's host-parameter limit (999 on
+# older builds) so a large ingest can't fail with "too many SQL variables".
+SELECT_BATCH_SIZE = 500
+
+
+class EmbeddingCache:
+    """Persistent content-addressed cache for chunk embeddings.
+
+    Vectors are keyed by ``sha256(model|text)`` so re-ingesting the same
+    corpus skips the remote embedding call entirely, and switching embedding
+    models invalidates naturally. Rows are stored in SQLite as raw float32
+    bytes; a small in-process LRU keeps hot entries out of the database for
+    same-session reuse.
+    """
+
+    def __init__(self, db_path: str, hot_size: int = 1024):
+        self.db_path = db_path
+        self._hot: OrderedDict[bytes, list[float]] = OrderedDict()
+        self._hot_size = hot_size
+        self._table_ready = False
+
+    @staticmethod
+    def make_key(model: str, text: str) -> bytes:
+        return hashlib.sha256(f"{model}|{text}".encode()).digest()
+
+    async def _ensure_table(self, db: aiosqlite.Connection) -> None:
+        if self._table_ready:
+            return
+        await db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS embedding_cache (
+                key BLOB PRIMARY KEY,
+                dim INTEGER,
+                vec BLOB
+            )
+            """
+        )
+        await db.commit()
+        self._table_ready = True
+
+    async def get_many(self, keys: list[bytes]) -> dict[bytes, list[float]]:
+        found: dict[bytes, list[float]] = {}
+        missing = []
+        for key in keys:
+            vec = self._hot.get(key)
+            if vec is not None:
+                self._hot.move_to_end(key)
+                found[key] = vec
+            else:
+                missing.append(key)
+
+        if missing:
+            async with aiosqlite.connect(self.db_path) as db:
+                await self._ensure_table(db)
+                for start in range(0, len(missing), SELECT_BATCH_SIZE):
+                    batch = missing[start : start + SELECT_BATCH_SIZE]
+                    placeholders = ",".join("?" * len(batch))
+                    async with db.execute(
+                        f"SELECT key, vec FROM embedding_cache WHERE key IN ({placeholders})", batch
+                    ) as cursor:
+                        async for key, blob in cursor:
+                            vec = np.frombuffer(blob, dtype=np.float32).tolist()
+                            found[key] = vec
+                            self._hot_put(key, vec)
+        return found
+
+    async def put_many(self, items: dict[bytes, list[float]]) -> None:
+        if not items:
+            return
+        rows = []
+        for key, vec in items.items():
+            self._hot_put(key, vec)
+            rows.append((key, len(vec), np.asarray(vec, dtype=np.float32).tobytes()))
+        async with aiosqlite.connect(self.db_path) as db:
+            await self._ensure_table(db)
+            await db.executemany("INSERT OR IGNORE INTO embedding_cache (key, dim, vec) VALUES (?, ?, ?)", rows)
+            await db.commit()
+
+    def _hot_put(self, key: bytes, vec: list[float]) -> None:
+        self._hot[key] = vec
+        self._hot.move_to_end(key)
+        while len(self._hot) > self._hot_size:
+            self._hot.popitem(last=False)
+
+
+_default_cache: EmbeddingCache | None = None
+
+
+def get_default_embedding_cache() -> EmbeddingCache | None:
+    """Return the process-wide embedding cache, or None when caching is disabled."""
+    global _default_cache
+    cache_dir = os.environ.get(EMBEDDING_CACHE_DIR_ENV)
+    if not cache_dir:
+        return None
+    if _default_cache is None or not _default_cache.db_path.startswith(cache_dir):
+        os.makedirs(cache_dir, exist_ok=True)
+        _default_cache = EmbeddingCache(db_path=os.path.join(cache_dir, "embedding_cache.db"))
+    return _default_cache
@@ -3,6 +3,7 @@
 #
 # This source code is licensed under the terms described in the LICENSE file in
 # the root directory of this source tree.
+import asyncio
 import base64
 import io
 import logging
@@ -31,6 +32,10 @@ from llama_stack.providers.datatypes import Api
 from llama_stack.providers.utils.inference.prompt_adapter import (
     interleaved_content_as_str,
 )
+from llama_stack.providers.utils.memory.embedding_cache import (
+    EmbeddingCache,
+    get_default_embedding_cache,
+)
 from llama_stack.providers.utils.vector_io.vector_utils import generate_chunk_id
 
 log = logging.getLogger(__name__)
@@ -47,6 +52,9 @@ class ChunkForDeletion(BaseModel):
     document_id: str
 
 
+# Max number of chunk contents sent in a single embeddings request
+EMBEDDING_BATCH_SIZE = 128
+
 # Constants for reranker types
 RERANKER_TYPE_RRF = "rrf"
 RERANKER_TYPE_WEIGHTED = "weighted"
@@ -294,12 +302,55 @@ class VectorDBWithIndex:
                 _validate_embedding(c.embedding, i, self.vector_db.embedding_dimension)
 
         if chunks_to_embed:
-            resp = await self.inference_api.embeddings(
-                self.vector_db.embedding_model,
-                [c.content for c in chunks_to_embed],
-            )
-            for c, embedding in zip(chunks_to_embed, resp.embeddings, strict=False):
-                c.embedding = embedding
+            # Deduplicate identical chunk text so repeated boilerplate embeds
+            # once, and window the request so a large ingest stays within
+            # provider batch limits instead of issuing one giant call.
+            content_index: dict[str, int] = {}
+            unique_texts: list[str] = []
+            unique_contents: list[Any] = []
+            positions = []
+            for c in chunks_to_embed:
+                text = interleaved_content_as_str(c.content)
+                idx = content_index.get(text)
+                if idx is None:
+                    idx = len(unique_contents)
+                    content_index[text] = idx
+                    unique_texts.append(text)
+                    unique_contents.append(c.content)
+                positions.append(idx)
+
+            model = self.vector_db.embedding_model
+            unique_embeddings: list[Any] = [None] * len(unique_contents)
+
+            # consult the persistent embedding cache (if enabled) so warm
+            # re-ingests of the same corpus skip the remote embedding call
+            cache = get_default_embedding_cache()
+            keys = [EmbeddingCache.make_key(model, text) for text in unique_texts] if cache else []
+            if cache:
+                cached = await cache.get_many(keys)
+                for i, key in enumerate(keys):
+                    if key in cached:
+                        unique_embeddings[i] = cached[key]
+
+            to_embed = [i for i, e in enumerate(unique_embeddings) if e is None]
+            if to_embed:
+                responses = await asyncio.gather(
+                    *(
+                        self.inference_api.embeddings(
+                            model,
+                            [unique_contents[j] for j in to_embed[i : i + EMBEDDING_BATCH_SIZE]],
+                        )
+                        for i in range(0, len(to_embed), EMBEDDING_BATCH_SIZE)
+                    )
+                )
+                new_embeddings = [e for r in responses for e in r.embeddings]
+                for i, embedding in zip(to_embed, new_embeddings, strict=False):
+                    unique_embeddings[i] = embedding
+                if cache:
+                    await cache.put_many({keys[i]: unique_embeddings[i] for i in to_embed})
+
+            for c, idx in zip(chunks_to_embed, positions, strict=False):
+                c.embedding = unique_embeddings[idx]
 
         embeddings = np.array([c.embedding for c in chunks], dtype=np.float32)
         await self.index.add_chunks(chunks, embeddings)
@@ -42,15 +42,35 @@ def _prepare_for_json(value: Any) -> str:
             return str(value)
 
 
-def trace_protocol[T](cls: type[T]) -> type[T]:
+def trace_protocol[T](cls: type[T] | None = None, *, sample_rate: float = 1.0):
     """
     A class decorator that automatically traces all methods in a protocol/base class
     and its inheriting classes.
+
+    Can be applied bare (``@trace_protocol``) or with a head-based sampling rate
+    (``@trace_protocol(sample_rate=0.01)``); with sampling, only every Nth call
+    to a method is traced and the rest bypass span creation entirely.
     """
+    if cls is None:
+        return lambda actual_cls: _trace_protocol(actual_cls, sample_rate)
+    return _trace_protocol(cls, sample_rate)
+
 
-    def trace_method(method: Callable) -> Callable:
+def _trace_protocol[T](cls: type[T], sample_rate: float) -> type[T]:
+    # a counter modulo is cheaper than drawing a random number on every call
+    sample_every = max(round(1 / sample_rate), 1) if 0 < sample_rate < 1.0 else 1
+
+    def trace_method(method: Callable, sample_every: int) -> Callable:
         is_async = asyncio.iscoroutinefunction(method)
         is_async_gen = inspect.isasyncgenfunction(method)
+        call_count = 0
+
+        def should_trace() -> bool:
+            if sample_every == 1:
+                return True
+            nonlocal call_count
+            call_count += 1
+            return (call_count - 1) % sample_every == 0
 
         def create_span_context(self: Any, *args: Any, **kwargs: Any) -> tuple:
             class_name = self.__class__.__name__
@@ -77,6 +97,11 @@ def trace_protocol[T](cls: type[T]) -> type[T]:
 
         @wraps(method)
         async def async_gen_wrapper(self: Any, *args: Any, **kwargs: Any) -> AsyncGenerator:
+            if not should_trace():
+                async for item in method(self, *args, **kwargs):
+                    yield item
+                return
+
             from llama_stack.providers.utils.telemetry import tracing
 
             class_name, method_name, span_attributes = create_span_context(self, *args, **kwargs)
@@ -92,6 +117,9 @@ def trace_protocol[T](cls: type[T]) -> type[T]:
 
         @wraps(method)
         async def async_wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+            if not should_trace():
+                return await method(self, *args, **kwargs)
+
             from llama_stack.providers.utils.telemetry import tracing
 
             class_name, method_name, span_attributes = create_span_context(self, *args, **kwargs)
@@ -107,6 +135,9 @@ def trace_protocol[T](cls: type[T]) -> type[T]:
 
         @wraps(method)
         def sync_wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+            if not should_trace():
+                return method(self, *args, **kwargs)
+
             from llama_stack.providers.utils.telemetry import tracing
 
             class_name, method_name, span_attributes = create_span_context(self, *args, **kwargs)
@@ -121,22 +152,34 @@ def trace_protocol[T](cls: type[T]) -> type[T]:
                     raise
 
         if is_async_gen:
-            return async_gen_wrapper
+            wrapper = async_gen_wrapper
         elif is_async:
-            return async_wrapper
+            wrapper = async_wrapper
         else:
-            return sync_wrapper
+            wrapper = sync_wrapper
+        wrapper.__trace_sample_every__ = sample_every
+        return wrapper
 
     original_init_subclass = getattr(cls, "__init_subclass__", None)
 
+    def resolve_sample_every(cls_child: type, name: str) -> int:
+        # an implementation may mix in several traced protocols, but only the
+        # first decorated base's hook in the MRO runs; sample each method at
+        # the rate of the protocol that declares it, not the hook owner's
+        for base in cls_child.__mro__[1:]:
+            if name in vars(base):
+                return vars(base).get("__trace_sample_every__", 1)
+        return sample_every
+
     def __init_subclass__(cls_child, **kwargs):  # noqa: N807
         if original_init_subclass:
             original_init_subclass(**kwargs)
 
         for name, method in vars(cls_child).items():
             if inspect.isfunction(method) and not name.startswith("_"):
-                setattr(cls_child, name, trace_method(method))  # noqa: B010
+                setattr(cls_child, name, trace_method(method, resolve_sample_every(cls_child, name)))  # noqa: B010
 
+    cls.__trace_sample_every__ = sample_every
     cls.__init_subclass__ = classmethod(__init_subclass__)
 
     return cls
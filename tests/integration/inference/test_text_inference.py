@@ -5,10 +5,12 @@
 # the root directory of this source tree.
 
 
+import functools
+import io
 from time import sleep
 
 import pytest
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 
 from llama_stack.models.llama.sku_list import resolve_model
 
@@ -17,12 +19,54 @@ from ..test_cases.test_case import TestCase
 PROVIDER_LOGPROBS_TOP_K = {"remote::together", "remote::fireworks", "remote::vllm"}
 
 
+# Structured-output answer models are defined at module scope so that pydantic
+# only generates their JSON schema once, not on every parametrized test run.
+class CompletionAnswerFormat(BaseModel):
+    name: str
+    year_born: str
+    year_retired: str
+
+
+COMPLETION_ANSWER_SCHEMA = CompletionAnswerFormat.model_json_schema()
+COMPLETION_ANSWER_ADAPTER = TypeAdapter(CompletionAnswerFormat)
+
+
+class NBAStats(BaseModel):
+    year_for_draft: int
+    num_seasons_in_nba: int
+
+
+class ChatAnswerFormat(BaseModel):
+    first_name: str
+    last_name: str
+    year_of_birth: int
+    nba_stats: NBAStats
+
+
+CHAT_ANSWER_SCHEMA = ChatAnswerFormat.model_json_schema()
+CHAT_ANSWER_ADAPTER = TypeAdapter(ChatAnswerFormat)
+
+
+# The client fixture is session-scoped and the registered models/providers
+# don't change during a run, so list them once per client instead of paying a
+# round trip for every parametrized case.
+@functools.cache
+def models_by_id(client_with_models):
+    models = {}
+    for m in client_with_models.models.list():
+        models[m.identifier] = m
+        models[m.provider_resource_id] = m
+    return models
+
+
+@functools.cache
+def providers_by_id(client_with_models):
+    return {p.provider_id: p for p in client_with_models.providers.list()}
+
+
 def skip_if_model_doesnt_support_completion(client_with_models, model_id):
-    models = {m.identifier: m for m in client_with_models.models.list()}
-    models.update({m.provider_resource_id: m for m in client_with_models.models.list()})
-    provider_id = models[model_id].provider_id
-    providers = {p.provider_id: p for p in client_with_models.providers.list()}
-    provider = providers[provider_id]
+    provider_id = models_by_id(client_with_models)[model_id].provider_id
+    provider = providers_by_id(client_with_models)[provider_id]
     if (
         provider.provider_type
         in (
@@ -39,11 +83,8 @@ def skip_if_model_doesnt_support_completion(client_with_models, model_id):
 
 
 def skip_if_model_doesnt_support_json_schema_structured_output(client_with_models, model_id):
-    models = {m.identifier: m for m in client_with_models.models.list()}
-    models.update({m.provider_resource_id: m for m in client_with_models.models.list()})
-    provider_id = models[model_id].provider_id
-    providers = {p.provider_id: p for p in client_with_models.providers.list()}
-    provider = providers[provider_id]
+    provider_id = models_by_id(client_with_models)[model_id].provider_id
+    provider = providers_by_id(client_with_models)[provider_id]
     if provider.provider_type in ("remote::sambanova",):
         pytest.skip(
             f"Model {model_id} hosted by {provider.provider_type} doesn't support json_schema structured output"
@@ -51,10 +92,7 @@ def skip_if_model_doesnt_support_json_schema_structured_output(client_with_model
 
 
 def get_llama_model(client_with_models, model_id):
-    models = {}
-    for m in client_with_models.models.list():
-        models[m.identifier] = m
-        models[m.provider_resource_id] = m
+    models = models_by_id(client_with_models)
 
     assert model_id in models, f"Model {model_id} not found"
 
@@ -107,8 +145,11 @@ def test_text_completion_streaming(client_with_models, text_model_id, test_case)
             "max_tokens": 50,
         },
     )
-    streamed_content = [chunk.delta for chunk in response]
-    content_str = "".join(streamed_content).lower().strip()
+    buf = io.StringIO()
+    for chunk in response:
+        if chunk.delta:
+            buf.write(chunk.delta)
+    content_str = buf.getvalue().lower().strip()
     # assert "blue" in content_str
     assert len(content_str) > 10
 
@@ -135,8 +176,11 @@ def test_text_completion_stop_sequence(client_with_models, text_model_id, infere
             "stop": ["1963"],
         },
     )
-    streamed_content = [chunk.delta for chunk in response]
-    content_str = "".join(streamed_content).lower().strip()
+    buf = io.StringIO()
+    for chunk in response:
+        if chunk.delta:
+            buf.write(chunk.delta)
+    content_str = buf.getvalue().lower().strip()
     assert "1963" not in content_str
 
 
@@ -211,11 +255,6 @@ def test_text_completion_log_probs_streaming(client_with_models, text_model_id,
 def test_text_completion_structured_output(client_with_models, text_model_id, test_case):
     skip_if_model_doesnt_support_completion(client_with_models, text_model_id)
 
-    class AnswerFormat(BaseModel):
-        name: str
-        year_born: str
-        year_retired: str
-
     tc = TestCase(test_case)
 
     user_input = tc["user_input"]
@@ -228,10 +267,10 @@ def test_text_completion_structured_output(client_with_models, text_model_id, te
         },
         response_format={
             "type": "json_schema",
-            "json_schema": AnswerFormat.model_json_schema(),
+            "json_schema": COMPLETION_ANSWER_SCHEMA,
         },
     )
-    answer = AnswerFormat.model_validate_json(response.content)
+    answer = COMPLETION_ANSWER_ADAPTER.validate_json(response.content)
     expected = tc["expected"]
     assert answer.name == expected["name"]
     assert answer.year_born == expected["year_born"]
@@ -283,9 +322,13 @@ def test_text_chat_completion_streaming(client_with_models, text_model_id, test_
         stream=True,
         timeout=120,  # Increase timeout to 2 minutes for large conversation history
     )
-    streamed_content = [str(chunk.event.delta.text.lower().strip()) for chunk in response]
-    assert len(streamed_content) > 0
-    assert expected.lower() in "".join(streamed_content)
+    buf = io.StringIO()
+    num_chunks = 0
+    for chunk in response:
+        buf.write(str(chunk.event.delta.text.lower().strip()))
+        num_chunks += 1
+    assert num_chunks > 0
+    assert expected.lower() in buf.getvalue()
 
 
 @pytest.mark.parametrize(
@@ -315,14 +358,18 @@ def test_text_chat_completion_with_tool_calling_and_non_streaming(client_with_mo
 # Will extract streamed text and separate it from tool invocation content
 # The returned tool inovcation content will be a string so it's easy to comapare with expected value
 # e.g. "[get_weather, {'location': 'San Francisco, CA'}]"
-def extract_tool_invocation_content(response):
-    tool_invocation_content: str = ""
+def extract_tool_invocation_content(response, expected_tool_name=None):
+    pieces: list[str] = []
     for chunk in response:
         delta = chunk.event.delta
         if delta.type == "tool_call" and delta.parse_status == "succeeded":
             call = delta.tool_call
-            tool_invocation_content += f"[{call.tool_name}, {call.arguments}]"
-    return tool_invocation_content
+            pieces.append(f"[{call.tool_name}, {call.arguments}]")
+            # stop draining the stream once the expected call has arrived, so
+            # the test doesn't wait out the rest of the generation
+            if expected_tool_name is not None and call.tool_name == expected_tool_name:
+                break
+    return "".join(pieces)
 
 
 @pytest.mark.parametrize(
@@ -341,8 +388,8 @@ def test_text_chat_completion_with_tool_calling_and_streaming(client_with_models
         tool_choice="auto",
         stream=True,
     )
-    tool_invocation_content = extract_tool_invocation_content(response)
     expected_tool_name = tc["tools"][0]["tool_name"]
+    tool_invocation_content = extract_tool_invocation_content(response, expected_tool_name=expected_tool_name)
     expected_argument = tc["expected"]
     assert tool_invocation_content == f"[{expected_tool_name}, {expected_argument}]"
 
@@ -365,8 +412,8 @@ def test_text_chat_completion_with_tool_choice_required(client_with_models, text
         },
         stream=True,
     )
-    tool_invocation_content = extract_tool_invocation_content(response)
     expected_tool_name = tc["tools"][0]["tool_name"]
+    tool_invocation_content = extract_tool_invocation_content(response, expected_tool_name=expected_tool_name)
     expected_argument = tc["expected"]
     assert tool_invocation_content == f"[{expected_tool_name}, {expected_argument}]"
 
@@ -400,16 +447,6 @@ def test_text_chat_completion_with_tool_choice_none(client_with_models, text_mod
 def test_text_chat_completion_structured_output(client_with_models, text_model_id, test_case):
     skip_if_model_doesnt_support_json_schema_structured_output(client_with_models, text_model_id)
 
-    class NBAStats(BaseModel):
-        year_for_draft: int
-        num_seasons_in_nba: int
-
-    class AnswerFormat(BaseModel):
-        first_name: str
-        last_name: str
-        year_of_birth: int
-        nba_stats: NBAStats
-
     tc = TestCase(test_case)
 
     response = client_with_models.inference.chat_completion(
@@ -417,11 +454,11 @@ def test_text_chat_completion_structured_output(client_with_models, text_model_i
         messages=tc["messages"],
         response_format={
             "type": "json_schema",
-            "json_schema": AnswerFormat.model_json_schema(),
+            "json_schema": CHAT_ANSWER_SCHEMA,
         },
         stream=False,
     )
-    answer = AnswerFormat.model_validate_json(response.completion_message.content)
+    answer = CHAT_ANSWER_ADAPTER.validate_json(response.completion_message.content)
     expected = tc["expected"]
     assert answer.first_name == expected["first_name"]
     assert answer.last_name == expected["last_name"]
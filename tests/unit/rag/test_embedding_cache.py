@@ -0,0 +1,62 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the terms described in the LICENSE file in
+# the root directory of this source tree.
+
+import numpy as np
+import pytest
+
+from llama_stack.providers.utils.memory.embedding_cache import SELECT_BATCH_SIZE, EmbeddingCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return EmbeddingCache(db_path=str(tmp_path / "embedding_cache.db"))
+
+
+class TestEmbeddingCache:
+    async def test_roundtrip(self, cache):
+        key = EmbeddingCache.make_key("test-model", "some chunk text")
+        await cache.put_many({key: [0.1, 0.2, 0.3]})
+
+        found = await cache.get_many([key])
+        assert np.allclose(found[key], [0.1, 0.2, 0.3])
+
+    async def test_missing_keys_are_omitted(self, cache):
+        key = EmbeddingCache.make_key("test-model", "some chunk text")
+        other = EmbeddingCache.make_key("test-model", "other chunk text")
+        await cache.put_many({key: [0.1, 0.2]})
+
+        found = await cache.get_many([key, other])
+        assert key in found
+        assert other not in found
+
+    async def test_keys_are_model_scoped(self):
+        key_a = EmbeddingCache.make_key("model-a", "same text")
+        key_b = EmbeddingCache.make_key("model-b", "same text")
+        assert key_a != key_b
+
+    async def test_lookup_larger_than_select_batch(self, tmp_path):
+        # more keys than fit in a single SELECT; must not hit SQLite's
+        # host-parameter limit
+        db_path = str(tmp_path / "embedding_cache.db")
+        items = {
+            EmbeddingCache.make_key("test-model", f"chunk {i}"): [float(i)] for i in range(SELECT_BATCH_SIZE + 100)
+        }
+        await EmbeddingCache(db_path=db_path).put_many(items)
+
+        reopened = EmbeddingCache(db_path=db_path)
+        missing = EmbeddingCache.make_key("test-model", "never stored")
+        found = await reopened.get_many([*items.keys(), missing])
+        assert len(found) == len(items)
+        assert missing not in found
+
+    async def test_persists_across_instances(self, tmp_path):
+        db_path = str(tmp_path / "embedding_cache.db")
+        key = EmbeddingCache.make_key("test-model", "some chunk text")
+        await EmbeddingCache(db_path=db_path).put_many({key: [1.0, 2.0]})
+
+        reopened = EmbeddingCache(db_path=db_path)
+        found = await reopened.get_many([key])
+        assert np.allclose(found[key], [1.0, 2.0])
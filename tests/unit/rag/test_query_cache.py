@@ -0,0 +1,190 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the terms described in the LICENSE file in
+# the root directory of this source tree.
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from llama_stack.apis.tools.rag_tool import RAGQueryConfig, RAGQueryResult
+from llama_stack.providers.inline.tool_runtime.rag.query_cache import QueryCache, quantize_int8
+
+
+class TestQueryCache:
+    async def test_exact_match_hit(self):
+        cache = QueryCache(max_size=4)
+        calls = 0
+
+        async def compute():
+            nonlocal calls
+            calls += 1
+            return RAGQueryResult(metadata={"call": calls})
+
+        config = RAGQueryConfig()
+        first = await cache.fetch("What is RAG?", ["db1"], config, compute)
+        second = await cache.fetch("what is  rag?", ["db1"], config, compute)
+
+        assert calls == 1
+        assert second is first
+
+    async def test_different_dbs_or_config_miss(self):
+        cache = QueryCache(max_size=4)
+        calls = 0
+
+        async def compute():
+            nonlocal calls
+            calls += 1
+            return RAGQueryResult()
+
+        await cache.fetch("query", ["db1"], RAGQueryConfig(), compute)
+        await cache.fetch("query", ["db2"], RAGQueryConfig(), compute)
+        await cache.fetch("query", ["db1"], RAGQueryConfig(max_chunks=10), compute)
+
+        assert calls == 3
+
+    async def test_invalidate_drops_entries_for_db(self):
+        cache = QueryCache(max_size=4)
+        calls = 0
+
+        async def compute():
+            nonlocal calls
+            calls += 1
+            return RAGQueryResult()
+
+        config = RAGQueryConfig()
+        await cache.fetch("query", ["db1", "db2"], config, compute)
+        cache.invalidate("db2")
+        await cache.fetch("query", ["db1", "db2"], config, compute)
+
+        assert calls == 2
+
+    async def test_concurrent_misses_collapse(self):
+        cache = QueryCache(max_size=4)
+        calls = 0
+
+        async def compute():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return RAGQueryResult()
+
+        config = RAGQueryConfig()
+        results = await asyncio.gather(*(cache.fetch("query", ["db1"], config, compute) for _ in range(5)))
+
+        assert calls == 1
+        assert all(r is results[0] for r in results)
+
+    async def test_semantic_hit_above_threshold(self):
+        embeddings = {
+            "capital of france": [1.0, 0.0],
+            "france's capital": [0.99, 0.14106735979665883],  # cosine 0.99 vs the first query
+            "tallest mountain": [0.0, 1.0],
+        }
+
+        async def embed_fn(text):
+            return embeddings[text]
+
+        cache = QueryCache(max_size=4, semantic_threshold=0.95, embed_fn=embed_fn)
+        calls = 0
+
+        async def compute():
+            nonlocal calls
+            calls += 1
+            return RAGQueryResult(metadata={"call": calls})
+
+        config = RAGQueryConfig()
+        first = await cache.fetch("capital of france", ["db1"], config, compute)
+        near = await cache.fetch("france's capital", ["db1"], config, compute)
+        far = await cache.fetch("tallest mountain", ["db1"], config, compute)
+
+        assert near is first
+        assert far is not first
+        assert calls == 2
+
+    async def test_semantic_hit_populates_exact_key(self):
+        embeds = 0
+
+        async def embed_fn(text):
+            nonlocal embeds
+            embeds += 1
+            return {"capital of france": [1.0, 0.0], "france's capital": [0.99, 0.14106735979665883]}[text]
+
+        cache = QueryCache(max_size=4, semantic_threshold=0.95, embed_fn=embed_fn)
+        calls = 0
+
+        async def compute():
+            nonlocal calls
+            calls += 1
+            return RAGQueryResult()
+
+        config = RAGQueryConfig()
+        first = await cache.fetch("capital of france", ["db1"], config, compute)
+        near = await cache.fetch("france's capital", ["db1"], config, compute)
+        # identical repeat of the near-duplicate must hit the exact LRU
+        # without paying another embedding call
+        repeat = await cache.fetch("france's capital", ["db1"], config, compute)
+
+        assert near is first
+        assert repeat is first
+        assert calls == 1
+        assert embeds == 2
+
+    async def test_locks_are_released_on_all_paths(self):
+        cache = QueryCache(max_size=4)
+
+        async def compute():
+            return RAGQueryResult()
+
+        async def failing_compute():
+            raise RuntimeError("retrieval failed")
+
+        config = RAGQueryConfig()
+        await cache.fetch("query", ["db1"], config, compute)
+        with pytest.raises(RuntimeError):
+            await cache.fetch("other query", ["db1"], config, failing_compute)
+
+        assert cache._locks == {}
+
+
+class TestHnswSemanticIndex:
+    def test_capacity_bounded_by_live_entries(self):
+        pytest.importorskip("hnswlib")
+        from llama_stack.providers.inline.tool_runtime.rag.query_cache import _HnswSemanticIndex
+
+        rng = np.random.default_rng(7)
+        index = _HnswSemanticIndex(max_elements=16)
+        # churn far more entries through the index than its capacity; deleted
+        # slots must be reused so the index never grows past max_elements
+        for i in range(200):
+            vec = rng.normal(size=32).astype(np.float32)
+            vec /= np.linalg.norm(vec)
+            index.add(f"key-{i}".encode(), b"ns", vec)
+            if i >= 15:
+                index.remove({f"key-{i - 15}".encode()})
+
+        assert index._max_elements == 16
+        assert len(index._meta) == 15
+
+
+class TestQuantization:
+    def test_quantize_int8_preserves_cosine(self):
+        rng = np.random.default_rng(42)
+        a = rng.normal(size=384).astype(np.float32)
+        b = a + rng.normal(scale=0.05, size=384).astype(np.float32)
+        a /= np.linalg.norm(a)
+        b /= np.linalg.norm(b)
+
+        qa, sa = quantize_int8(a)
+        qb, sb = quantize_int8(b)
+        approx = (qa.astype(np.int32) @ qb.astype(np.int32)) * (sa * sb)
+
+        assert qa.dtype == np.int8
+        assert abs(approx - float(a @ b)) < 0.01
+
+    def test_quantize_int8_zero_vector(self):
+        q, scale = quantize_int8(np.zeros(8, dtype=np.float32))
+        assert scale == 1.0
+        assert not q.any()
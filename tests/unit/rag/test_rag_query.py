@@ -14,17 +14,22 @@ from llama_stack.apis.vector_io import (
     ChunkMetadata,
     QueryChunksResponse,
 )
+from llama_stack.providers.inline.tool_runtime.rag.config import RagToolRuntimeConfig
 from llama_stack.providers.inline.tool_runtime.rag.memory import MemoryToolRuntimeImpl
 
 
 class TestRagQuery:
     async def test_query_raises_on_empty_vector_db_ids(self):
-        rag_tool = MemoryToolRuntimeImpl(config=MagicMock(), vector_io_api=MagicMock(), inference_api=MagicMock())
+        rag_tool = MemoryToolRuntimeImpl(
+            config=RagToolRuntimeConfig(), vector_io_api=MagicMock(), inference_api=MagicMock()
+        )
         with pytest.raises(ValueError):
             await rag_tool.query(content=MagicMock(), vector_db_ids=[])
 
     async def test_query_chunk_metadata_handling(self):
-        rag_tool = MemoryToolRuntimeImpl(config=MagicMock(), vector_io_api=MagicMock(), inference_api=MagicMock())
+        rag_tool = MemoryToolRuntimeImpl(
+            config=RagToolRuntimeConfig(), vector_io_api=MagicMock(), inference_api=MagicMock()
+        )
         content = "test query content"
         vector_db_ids = ["db1"]
 
@@ -77,3 +82,11 @@ class TestRagQuery:
         # Test that invalid mode raises an error
         with pytest.raises(ValueError):
             RAGQueryConfig(mode="wrong_mode")
+
+    def test_trace_sampling_reaches_impl(self):
+        # insert/query are declared on RAGToolRuntime, which is traced at
+        # sample_rate=0.01; methods declared on undecorated protocols keep
+        # full tracing even though ToolRuntime's hook does the wrapping
+        assert MemoryToolRuntimeImpl.insert.__trace_sample_every__ == 100
+        assert MemoryToolRuntimeImpl.query.__trace_sample_every__ == 100
+        assert MemoryToolRuntimeImpl.register_toolgroup.__trace_sample_every__ == 1
@@ -16,6 +16,7 @@ import pytest
 from llama_stack.apis.tools import RAGDocument
 from llama_stack.apis.vector_io import Chunk
 from llama_stack.providers.utils.memory.vector_store import (
+    EMBEDDING_BATCH_SIZE,
     URL,
     VectorDBWithIndex,
     _validate_embedding,
@@ -319,3 +320,65 @@ class TestVectorDBWithIndex:
         args = mock_index.add_chunks.call_args[0]
         assert len(args[0]) == 3
         assert np.array_equal(args[1], np.array([[0.1, 0.1, 0.1], [0.2, 0.2, 0.2], [0.3, 0.3, 0.3]], dtype=np.float32))
+
+    async def test_insert_chunks_deduplicates_identical_text(self):
+        mock_vector_db = MagicMock()
+        mock_vector_db.embedding_model = "test-model with duplicate chunks"
+        mock_index = AsyncMock()
+        mock_inference_api = AsyncMock()
+
+        vector_db_with_index = VectorDBWithIndex(
+            vector_db=mock_vector_db, index=mock_index, inference_api=mock_inference_api
+        )
+
+        chunks = [
+            Chunk(content="Repeated", embedding=None, metadata={}),
+            Chunk(content="Repeated", embedding=None, metadata={}),
+            Chunk(content="Unique", embedding=None, metadata={}),
+            Chunk(content="Repeated", embedding=None, metadata={}),
+        ]
+
+        mock_inference_api.embeddings.return_value.embeddings = [[0.1, 0.1, 0.1], [0.2, 0.2, 0.2]]
+
+        await vector_db_with_index.insert_chunks(chunks)
+
+        # repeated text is embedded once; every duplicate gets the same vector
+        mock_inference_api.embeddings.assert_called_once_with(
+            "test-model with duplicate chunks", ["Repeated", "Unique"]
+        )
+        mock_index.add_chunks.assert_called_once()
+        args = mock_index.add_chunks.call_args[0]
+        assert np.array_equal(
+            args[1],
+            np.array([[0.1, 0.1, 0.1], [0.1, 0.1, 0.1], [0.2, 0.2, 0.2], [0.1, 0.1, 0.1]], dtype=np.float32),
+        )
+
+    async def test_insert_chunks_batches_large_requests(self):
+        mock_vector_db = MagicMock()
+        mock_vector_db.embedding_model = "test-model with many chunks"
+        mock_index = AsyncMock()
+        mock_inference_api = AsyncMock()
+
+        vector_db_with_index = VectorDBWithIndex(
+            vector_db=mock_vector_db, index=mock_index, inference_api=mock_inference_api
+        )
+
+        n_chunks = EMBEDDING_BATCH_SIZE + 2
+        chunks = [Chunk(content=f"Test {i}", embedding=None, metadata={}) for i in range(n_chunks)]
+
+        def fake_embeddings(model, contents):
+            return MagicMock(embeddings=[[float(c.split()[-1])] * 3 for c in contents])
+
+        mock_inference_api.embeddings.side_effect = fake_embeddings
+
+        await vector_db_with_index.insert_chunks(chunks)
+
+        # the request is windowed into batches and the vectors reassembled in order
+        assert mock_inference_api.embeddings.call_count == 2
+        first_contents = mock_inference_api.embeddings.call_args_list[0][0][1]
+        second_contents = mock_inference_api.embeddings.call_args_list[1][0][1]
+        assert len(first_contents) == EMBEDDING_BATCH_SIZE
+        assert second_contents == [f"Test {EMBEDDING_BATCH_SIZE}", f"Test {EMBEDDING_BATCH_SIZE + 1}"]
+        mock_index.add_chunks.assert_called_once()
+        args = mock_index.add_chunks.call_args[0]
+        assert np.array_equal(args[1], np.array([[float(i)] * 3 for i in range(n_chunks)], dtype=np.float32))